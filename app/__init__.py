@@ -1,3 +1,4 @@
 from .logic_functions import create_new_generation
+from .statistics import BoardStatistics
 
-__all__ = ['create_new_generation']
+__all__ = ['create_new_generation', 'BoardStatistics']
@@ -0,0 +1,158 @@
+# this file contains a look-ahead buffer that computes the next generations of
+# the game in a background thread, so that the board can be updated without
+# waiting for create_new_generation on every frame
+
+import threading
+from collections import deque
+from typing import List, Optional, Tuple
+
+from app.grid_functions import Grid, Position, copy_grid
+from app.logic_functions import create_new_generation
+
+# a frame consists of the epoch it was computed in, the grid of the generation,
+# the positions of the cells that were born or died and whether this generation
+# is equal to the one before it (equilibrium)
+Frame = Tuple[int, Grid, List[Position], bool]
+
+
+class GenerationBuffer:
+    """
+    Producer/consumer pipeline for the generations of the game. A background
+    worker computes generations ahead of the display and stores them in a
+    bounded buffer, the render loop only has to take the frames that are ready.
+    Whenever the board is edited (clicks, reset, new grid size), restart() has
+    to be called, which throws away all frames computed so far and lets the
+    worker continue from the edited board. The worker only computes frames
+    while the buffer is resumed (while the simulation is running), so that
+    editing a paused board does not compute generations that are never shown.
+    """
+
+    def __init__(self, grid: Grid, max_frames: int = 8):
+        """
+        :param grid: the board from which the first generations are computed
+        :param max_frames: how many generations may be computed ahead of the
+                           display
+        """
+        # the frames are guarded by the condition, which is also used to wake
+        # the worker when there is room for a new frame, a new board or the
+        # buffer has been stopped
+        self._frames: "deque[Frame]" = deque()
+        self._max_frames = max_frames
+        self._lock = threading.Condition()
+        # the epoch is increased on every restart, so that frames which were
+        # computed from an outdated board can be recognised and thrown away
+        self._epoch = 0
+        self._seed: Optional[Grid] = copy_grid(grid)
+        self._stopped = False
+        # the buffer starts paused, resume() is called when the simulation
+        # starts running
+        self._running = False
+        self._worker = threading.Thread(target=self._produce, daemon=True)
+        self._worker.start()
+
+    def restart(self, grid: Grid) -> None:
+        """
+        invalidates all generations computed so far and makes the worker start
+        again from the given board
+        :param grid: the (edited) board from which to continue
+        :return: None
+        """
+        with self._lock:
+            self._epoch += 1
+            self._seed = copy_grid(grid)
+            self._frames.clear()
+            self._lock.notify()
+
+    def resume(self) -> None:
+        """
+        lets the worker compute generations (e.g., when the simulation starts)
+        :return: None
+        """
+        with self._lock:
+            self._running = True
+            self._lock.notify()
+
+    def pause(self) -> None:
+        """
+        stops the worker from computing more generations until resume() is
+        called. Frames that are already in the buffer are kept.
+        :return: None
+        """
+        with self._lock:
+            self._running = False
+
+    def next_frame(self) -> Optional[Tuple[Grid, List[Position], bool]]:
+        """
+        takes the next generation out of the buffer without waiting
+        :return: the next generation, the positions of the cells that were
+                 born or died and whether it is in equilibrium, or None if no
+                 generation is ready yet
+        """
+        with self._lock:
+            if not self._frames:
+                return None
+            # restart() removes all frames of the old board, so the frames in
+            # the buffer always belong to the current board
+            _, grid, changes, is_stable = self._frames.popleft()
+            # there is room for a new frame now
+            self._lock.notify()
+            return grid, changes, is_stable
+
+    def stop(self) -> None:
+        """
+        stops the background worker (e.g., when the session has ended)
+        :return: None
+        """
+        with self._lock:
+            self._stopped = True
+            self._frames.clear()
+            self._lock.notify()
+
+    def _produce(self) -> None:
+        # the worker waits until there is a board to start from and the buffer
+        # is resumed, and then keeps computing generations until the buffer is
+        # restarted, the game reaches a state of equilibrium or the buffer is
+        # stopped
+        while True:
+            with self._lock:
+                while (
+                        (self._seed is None or not self._running)
+                        and not self._stopped
+                ):
+                    self._lock.wait()
+                if self._stopped:
+                    return
+                epoch = self._epoch
+                grid = self._seed
+                self._seed = None
+
+            while True:
+                changes: List[Position] = []
+                new_generation = create_new_generation(grid, changes)
+                # if no cell was born or died, the game is in equilibrium
+                is_stable = not changes
+                if not self._put((epoch, new_generation, changes, is_stable)):
+                    break
+                # after an equilibrium, all following generations are the
+                # same, so there is no need to compute them
+                if is_stable:
+                    break
+                grid = new_generation
+
+    def _put(self, frame: Frame) -> bool:
+        # put a frame into the buffer, waiting while the buffer is full or
+        # paused. Returns False if the frame became outdated while waiting
+        with self._lock:
+            while (
+                    not self._stopped
+                    and frame[0] == self._epoch
+                    and (
+                        len(self._frames) >= self._max_frames
+                        or not self._running
+                    )
+            ):
+                self._lock.wait()
+            if self._stopped or frame[0] != self._epoch:
+                return False
+            self._frames.append(frame)
+            return True
@@ -1,7 +1,9 @@
-from typing import List
+from typing import List, Optional, Tuple
 
 
 Grid = List[List[int]]
+# position of a cell in a grid (row, column)
+Position = Tuple[int, int]
 
 def create_grid(nrow: int, ncol: int) -> Grid:
     """
@@ -22,13 +24,17 @@ def copy_grid(grid: Grid) -> Grid:
     return [row[:] for row in grid]
 
 
-def toggle_at_position(grid: Grid, row: int, col: int) -> Grid:
+def toggle_at_position(
+        grid: Grid, row: int, col: int, changes: Optional[List[Position]] = None
+) -> Grid:
     """
     toggles the value at a specific position in an array from 0 to 1 or from 1
     to 0
     :param grid: array filled with 0s and 1s
     :param row & col: indicate position of the value in array that should be
                       toggled
+    :param changes: optional list to which the toggled position is appended
+                    (e.g., to update the BoardStatistics)
     :return None
     """
     grid_copy = copy_grid(grid)
@@ -36,4 +42,6 @@ def toggle_at_position(grid: Grid, row: int, col: int) -> Grid:
         grid_copy[row][col] = 1
     else:
         grid_copy[row][col] = 0
-    return grid_copy
\ No newline at end of file
+    if changes is not None:
+        changes.append((row, col))
+    return grid_copy
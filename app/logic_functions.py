@@ -2,7 +2,9 @@
 # then initiate the according action (keep the cell alive, bring it alive or let it die
 # according to the game rules)
 
-from app.grid_functions import Grid, copy_grid
+from typing import List, Optional
+
+from app.grid_functions import Grid, Position, copy_grid
 
 
 def is_valid_pos(row, column, nrows, ncols) -> bool:
@@ -76,7 +78,9 @@ def get_number_of_adjacent_live_cells(
     return number_live_cells
 
 
-def create_new_generation(grid: Grid) -> Grid:
+def create_new_generation(
+        grid: Grid, changes: Optional[List[Position]] = None
+) -> Grid:
     """
     This function generates the new generation of alive in dead cells within Conway's Game
     of Life. It determines which cells in a given array (the game grid) live or die from
@@ -87,6 +91,9 @@ def create_new_generation(grid: Grid) -> Grid:
     :param grid: array with alive and dead cells, for which the next generation should
                  be determined; alive cells should be indicated by 1, while dead cells
                  should be marked with 0
+    :param changes: optional list to which the positions of all cells that are
+                    born or die are appended (e.g., to update the
+                    BoardStatistics without scanning the grid again)
     :return: array with values indicating which cells survive/come alive/die in
              the new generation
     """
@@ -115,5 +122,8 @@ def create_new_generation(grid: Grid) -> Grid:
                 # Bring cell alive if the number of neighbours == 3.
                 if alive == 3:
                     array_copy[row_idx][col_idx] = 1
+            # remember the cells that were born or died
+            if changes is not None and array_copy[row_idx][col_idx] != cell_value:
+                changes.append((row_idx, col_idx))
 
     return array_copy
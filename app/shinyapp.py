@@ -6,18 +6,21 @@ from htmltools import Tag
 
 from shiny import App, Inputs, Outputs, Session, reactive, render, ui
 
+from app.generation_buffer import GenerationBuffer
 from app.grid_functions import Grid, create_grid, toggle_at_position
-from app.logic_functions import create_new_generation
+from app.statistics import BoardStatistics
 from app.shiny_extensions import (register_dynamic_events,
                                            session_is_active,
                                            unstyled_input_action_button)
 
 
-def create_grid_ui(grid: Grid) -> Tag:
+def create_grid_ui(grid: Grid, statistics: BoardStatistics) -> Tag:
     """
     creates the grid for playing the Game of Life, including all the buttons, which
-    can later be displayed in the UI
+    can later be displayed in the UI. Dead cells are shaded according to how
+    active they have recently been (activity heatmap of the statistics).
     :param grid: grid to turn into the game board
+    :param statistics: statistics of the board, used for the activity heatmap
     :return: grid in a grid container
     """
     n_rows = len(grid)
@@ -31,10 +34,22 @@ def create_grid_ui(grid: Grid) -> Tag:
             # the value of the grid cell at that position (can be either 1 or 0)
             selected = grid[row_idx][col_idx]
             button_class = "grid-button action-button "
+            button_attrs = {}
             # if the value of a cell is 1, it is coloured to mark it as an
             # alive cell
             if selected == 1:
                 button_class += "live-cell"
+            else:
+                # dead cells that were recently born or died are shaded. The
+                # activity can be any positive number, so it is turned into a
+                # value between 0 and 1 for the opacity of the shading
+                activity = statistics.activity(row_idx, col_idx)
+                if activity > 0.05:
+                    button_class += "active-cell"
+                    button_attrs["style"] = (
+                        f"--activity: {activity / (1 + activity):.2f}"
+                    )
+            button_attrs["class"] = button_class
             # button ID consisting of its row and col
             btn_id = f"btn_{row_idx}_{col_idx}"
             cols.append(
@@ -43,7 +58,7 @@ def create_grid_ui(grid: Grid) -> Tag:
                     # unstyled input button because shiny buttons can't be
                     # styled to look like I want them to look
                     unstyled_input_action_button(
-                        btn_id, " ", {"class": button_class}
+                        btn_id, " ", button_attrs
                     ),
                 )
             )
@@ -61,6 +76,38 @@ def create_grid_ui(grid: Grid) -> Tag:
     return ui.tags.div({"class": "grid-container"}, *rows)
 
 
+def create_statistics_ui(statistics: BoardStatistics) -> Tag:
+    """
+    creates the overview of the board statistics, which can later be displayed
+    in the UI
+    :param statistics: statistics of the board
+    :return: the statistics in a div
+    """
+    bounding_box = statistics.bounding_box
+    if bounding_box is None:
+        bounding_box_text = "-"
+    else:
+        # rows and columns are counted from 1 in the UI
+        first_row, first_col, last_row, last_col = bounding_box
+        bounding_box_text = (
+            f"rows {first_row + 1}-{last_row + 1}, "
+            f"columns {first_col + 1}-{last_col + 1}"
+        )
+    return ui.tags.div(
+        ui.tags.p(f"Generation: {statistics.generation}"),
+        ui.tags.p(
+            f"Population: {statistics.population} "
+            f"({statistics.density:.0%} of the grid)"
+        ),
+        ui.tags.p(f"Births: {statistics.births}, deaths: {statistics.deaths}"),
+        ui.tags.p(f"Alive cells in: {bounding_box_text}"),
+        ui.tags.p(
+            {"class": "small-text"},
+            "Shaded cells on the grid have recently been born or died.",
+        ),
+    )
+
+
 def create_btn_id_list(dynamic_grid: reactive.Value[Grid]) -> List[str]:
     """
     Creates a list with all button_ids in a dynamic_grid
@@ -81,38 +128,69 @@ async def update_board(
         shiny_input: Inputs,
         is_simulation_running: reactive.Value[bool],
         dynamic_grid: reactive.Value[Grid],
+        generations: GenerationBuffer,
+        statistics: BoardStatistics,
 ):
     """
     updates the board every 1/(2*n) seconds so that it depicts the new
-    generation of alive cells
+    generation of alive cells. The generations themselves are computed ahead of
+    time by the GenerationBuffer, so this function only has to display them.
     """
-    # function is active as long as the session is active (as long as the
-    # website is open)
-    while session_is_active(session):
-        # watches if the simulation is running (every 0.1 seconds)
-        # noinspection PyProtectedMember
-        if not is_simulation_running._value:
-            await asyncio.sleep(0.1)
-            continue
-        # if the simulation is running [is_simulation_running == TRUE], the grid is updated
-        # noinspection PyProtectedMember
-        old_generation = dynamic_grid._value
-        new_generation = create_new_generation(old_generation)
-
-        # if the old generation is the same as the new generation we know that
-        # we got stuck and there is no need to simulate anymore.
-        if old_generation == new_generation:
-            is_simulation_running.set(False)
-            ui.notification_show("The game has reached a state of equilibrium.")
-            await reactive.flush()
-            continue
+    loop = asyncio.get_running_loop()
+    # point in time at which the next generation should be displayed
+    next_frame_at = loop.time()
+    try:
+        # function is active as long as the session is active (as long as the
+        # website is open)
+        while session_is_active(session):
+            # watches if the simulation is running (every 0.1 seconds)
+            # noinspection PyProtectedMember
+            if not is_simulation_running._value:
+                await asyncio.sleep(0.1)
+                next_frame_at = loop.time()
+                continue
+            # if the simulation is running [is_simulation_running == TRUE], the
+            # next generation is taken from the buffer
+            frame = generations.next_frame()
+            # if the next generation has not been computed yet, check again in
+            # a moment
+            if frame is None:
+                await asyncio.sleep(0.005)
+                continue
+            new_generation, changes, is_stable = frame
 
-        dynamic_grid.set(new_generation)
-        # notify shiny that a value has changed
-        await reactive.flush()
-        # then the function sleeps for 1/(2*n) seconds
-        # noinspection PyProtectedMember
-        await asyncio.sleep(1 / (2 * shiny_input.speed_slider._value))
+            # if the old generation is the same as the new generation we know
+            # that we got stuck and there is no need to simulate anymore.
+            if is_stable:
+                is_simulation_running.set(False)
+                generations.pause()
+                ui.notification_show(
+                    "The game has reached a state of equilibrium."
+                )
+                # start the buffer again from the current board, so that the
+                # equilibrium is detected again if the simulation is restarted
+                # noinspection PyProtectedMember
+                generations.restart(dynamic_grid._value)
+                await reactive.flush()
+                continue
+
+            # the statistics are updated with the cells that changed, before the
+            # new generation is displayed
+            statistics.record_generation(new_generation, changes)
+            dynamic_grid.set(new_generation)
+            # notify shiny that a value has changed
+            await reactive.flush()
+            # then the function sleeps until 1/(2*n) seconds have passed since
+            # the last generation was due. The time it took to display this
+            # generation is therefore not added on top of the delay. If we are
+            # already behind, we don't try to catch up, but continue from now
+            # noinspection PyProtectedMember
+            interval = 1 / (2 * shiny_input.speed_slider._value)
+            next_frame_at = max(next_frame_at + interval, loop.time())
+            await asyncio.sleep(next_frame_at - loop.time())
+    finally:
+        # the session has ended, so no more generations are needed
+        generations.stop()
 
 
 # UI ----
@@ -219,6 +297,11 @@ app_ui = ui.page_bootstrap(
                     ui.input_action_button("submit_grid_size",
                                            "Set grid size"),
                 ),
+                # div with the statistics of the board
+                ui.tags.div(
+                    ui.tags.p({"class": "bold"}, "Statistics"),
+                    ui.output_ui("board_statistics"),
+                ),
             ),
             # grid
             ui.output_ui("grid"),
@@ -244,11 +327,24 @@ def server(shiny_input: Inputs, output: Outputs, session: Session):
     # the size of the grid can be adjusted, so the buttons in the grid change.
     buttons = reactive.Value(create_btn_id_list(dynamic_grid))
 
+    # here, I create the buffer in which the next generations are computed
+    # ahead of time. Whenever the board is edited, it has to be restarted. It
+    # only computes generations while the simulation is running.
+    # noinspection PyProtectedMember
+    generations = GenerationBuffer(dynamic_grid._value)
+    # here, I create the statistics of the board (population, births, ...),
+    # which are updated with every generation and every click on the grid
+    # noinspection PyProtectedMember
+    statistics = BoardStatistics(dynamic_grid._value)
+
     # periodically check if the simulation is running and if yes, update the
     # board. unfortunately this is the only way to do that in shiny, because
     # async timers/threading is not supported
     asyncio.create_task(
-        update_board(session, shiny_input, is_simulation_running, dynamic_grid)
+        update_board(
+            session, shiny_input, is_simulation_running, dynamic_grid,
+            generations, statistics
+        )
     )
 
     # grid ---
@@ -273,9 +369,14 @@ def server(shiny_input: Inputs, output: Outputs, session: Session):
 
         # toggle the value of the grid cell at the determined position. If the
         # value was 0 before, we put in a 1, otherwise we put a 0
-        dynamic_grid.set(
-            toggle_at_position(dynamic_grid.get(), row_idx, col_idx)
+        changes = []
+        new_grid = toggle_at_position(
+            dynamic_grid.get(), row_idx, col_idx, changes
         )
+        statistics.record_edit(new_grid, changes)
+        dynamic_grid.set(new_grid)
+        # the generations computed so far belong to the old board
+        generations.restart(new_grid)
 
     # show alive cells
     @output
@@ -285,7 +386,19 @@ def server(shiny_input: Inputs, output: Outputs, session: Session):
         renders the grid (after values have been toggled by clicking on them)
         :return: the adapted/updated grid
         """
-        return create_grid_ui(dynamic_grid())
+        return create_grid_ui(dynamic_grid(), statistics)
+
+    # show statistics of the board
+    @output
+    @render.ui
+    def board_statistics():
+        """
+        renders the statistics of the board. They are updated together with the
+        grid, so the grid is used to know when they have to be rendered again.
+        :return: the statistics as a list of paragraphs
+        """
+        dynamic_grid()
+        return create_statistics_ui(statistics)
 
     # adjust grid size
     @reactive.Effect
@@ -322,8 +435,11 @@ def server(shiny_input: Inputs, output: Outputs, session: Session):
             return
         # stop a possibly ongoing simulation when a new grid size is set
         is_simulation_running.set(False)
+        generations.pause()
         # set the new grid size
         dynamic_grid.set(create_grid(grid_rows, grid_cols))
+        generations.restart(dynamic_grid.get())
+        statistics.reset(dynamic_grid.get())
         # update dynamic list of buttons in the grid
         buttons.set(create_btn_id_list(dynamic_grid))
 
@@ -340,7 +456,10 @@ def server(shiny_input: Inputs, output: Outputs, session: Session):
                 shiny_input.grid_rows.get(), shiny_input.grid_cols.get()
             )
         )
+        generations.restart(dynamic_grid.get())
+        statistics.reset(dynamic_grid.get())
         is_simulation_running.set(False)
+        generations.pause()
 
     # start/pause button ---
     @reactive.Effect
@@ -349,9 +468,14 @@ def server(shiny_input: Inputs, output: Outputs, session: Session):
         """
         whenever the button is clicked, the value of is_simulation_running is
         changed from True to False or the other way around, depending on the
-        current value.
+        current value. The buffer only computes generations while the
+        simulation is running.
         """
         is_simulation_running.set(not is_simulation_running.get())
+        if is_simulation_running.get():
+            generations.resume()
+        else:
+            generations.pause()
 
     @output
     @render.ui()
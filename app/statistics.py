@@ -0,0 +1,179 @@
+# this file contains the statistics of the board (population, births, deaths,
+# bounding box and activity heatmap). They are not computed by scanning the
+# whole grid, but are updated with the cells that changed, which are reported
+# by create_new_generation and toggle_at_position
+
+from typing import List, Optional, Tuple
+
+from app.grid_functions import Grid, Position
+
+
+BoundingBox = Tuple[int, int, int, int]
+
+
+class BoardStatistics:
+    """
+    Statistics of a board that are kept up to date incrementally. Every
+    generation only the cells that changed have to be recorded (see
+    record_generation and record_edit), and all statistics can then be queried
+    without looking at the grid again.
+    """
+
+    def __init__(self, grid: Grid, decay: float = 0.9):
+        """
+        :param grid: the board the statistics should start from
+        :param decay: factor by which the activity of a cell decreases every
+                      generation (between 0 and 1)
+        """
+        self.decay = decay
+        self.reset(grid)
+
+    def reset(self, grid: Grid) -> None:
+        """
+        starts the statistics again from the given board (e.g., after the
+        board has been reset or resized). This is the only time the whole grid
+        is scanned.
+        :param grid: the new board
+        :return: None
+        """
+        n_rows = len(grid)
+        n_cols = len(grid[0])
+        self.generation = 0
+        self.births = 0
+        self.deaths = 0
+        self.population = 0
+        # number of alive cells in every row and column, needed to keep the
+        # bounding box up to date when cells die
+        self._row_counts = [0] * n_rows
+        self._col_counts = [0] * n_cols
+        # activity of every cell and the generation in which it was last
+        # updated. The decay is only applied when a cell is looked at, so not
+        # every cell has to be updated in every generation
+        self._activity = [[0.0] * n_cols for _ in range(n_rows)]
+        self._activity_at = [[0] * n_cols for _ in range(n_rows)]
+        self._bounding_box: Optional[BoundingBox] = None
+
+        for row_idx, row in enumerate(grid):
+            for col_idx, cell_value in enumerate(row):
+                if cell_value == 1:
+                    self._row_counts[row_idx] += 1
+                    self._col_counts[col_idx] += 1
+                    self.population += 1
+        self._update_bounding_box([])
+
+    @property
+    def bounding_box(self) -> Optional[BoundingBox]:
+        """
+        :return: smallest box (first row, first column, last row, last column)
+                 that contains all alive cells, or None if no cell is alive
+        """
+        return self._bounding_box
+
+    @property
+    def density(self) -> float:
+        """
+        :return: the share of cells on the board that are alive
+        """
+        return self.population / (len(self._row_counts) * len(self._col_counts))
+
+    def activity(self, row: int, col: int) -> float:
+        """
+        returns how active a cell has been recently. Every birth or death of
+        the cell adds 1, and the value decreases by the decay factor every
+        generation.
+        :param row & col: indicate the position of the cell
+        :return: activity of the cell
+        """
+        age = self.generation - self._activity_at[row][col]
+        return self._activity[row][col] * self.decay ** age
+
+    def heatmap(self) -> List[List[float]]:
+        """
+        :return: array with the activity of every cell on the board
+        """
+        return [
+            [self.activity(row_idx, col_idx) for col_idx in range(len(row))]
+            for row_idx, row in enumerate(self._activity)
+        ]
+
+    def record_generation(self, grid: Grid, changes: List[Position]) -> None:
+        """
+        updates the statistics with a new generation
+        :param grid: the new generation
+        :param changes: positions of the cells that were born or died, as
+                        reported by create_new_generation
+        :return: None
+        """
+        self.generation += 1
+        self.births = 0
+        self.deaths = 0
+        for row, col in changes:
+            if grid[row][col] == 1:
+                self.births += 1
+            else:
+                self.deaths += 1
+            # bring the activity up to date before adding this change to it
+            self._activity[row][col] = self.activity(row, col) + 1
+            self._activity_at[row][col] = self.generation
+        self._apply(grid, changes)
+
+    def record_edit(self, grid: Grid, changes: List[Position]) -> None:
+        """
+        updates the statistics after cells have been toggled by hand. Edits are
+        not counted as births, deaths or activity, only population and
+        bounding box change.
+        :param grid: the edited board
+        :param changes: positions of the toggled cells, as reported by
+                        toggle_at_position
+        :return: None
+        """
+        self._apply(grid, changes)
+
+    def _apply(self, grid: Grid, changes: List[Position]) -> None:
+        # update the population and the row and column counts with the cells
+        # that changed
+        born = []
+        for row, col in changes:
+            step = 1 if grid[row][col] == 1 else -1
+            self._row_counts[row] += step
+            self._col_counts[col] += step
+            self.population += step
+            if step == 1:
+                born.append((row, col))
+        self._update_bounding_box(born)
+
+    def _update_bounding_box(self, born: List[Position]) -> None:
+        if self.population == 0:
+            self._bounding_box = None
+            return
+        # all alive cells are inside the old box or have just been born, so the
+        # new box can be found by growing the old box by the born cells and then
+        # shrinking it past the rows and columns that are now empty
+        if self._bounding_box is None:
+            first_row, first_col = len(self._row_counts), len(self._col_counts)
+            last_row, last_col = -1, -1
+        else:
+            first_row, first_col, last_row, last_col = self._bounding_box
+        for row, col in born:
+            first_row = min(first_row, row)
+            last_row = max(last_row, row)
+            first_col = min(first_col, col)
+            last_col = max(last_col, col)
+        # after a reset() no cells are reported as born, so the box has to be
+        # searched in the whole board
+        if last_row == -1:
+            first_row, first_col = 0, 0
+            last_row = len(self._row_counts) - 1
+            last_col = len(self._col_counts) - 1
+        first_row, last_row = _shrink(self._row_counts, first_row, last_row)
+        first_col, last_col = _shrink(self._col_counts, first_col, last_col)
+        self._bounding_box = (first_row, first_col, last_row, last_col)
+
+
+def _shrink(counts: List[int], first: int, last: int) -> Tuple[int, int]:
+    # move both ends inwards until they reach a row/column with alive cells
+    while counts[first] == 0:
+        first += 1
+    while counts[last] == 0:
+        last -= 1
+    return first, last